@@ -1,71 +1,159 @@
 """Alert system for ClaudeWatch — sound + red screen flash."""
 
-import time
-import threading
+# AppKit/Quartz are imported inside the functions that need them, so
+# loading this module stays cheap until the first alert fires.
 
-from AppKit import (
-    NSSound,
-    NSWindow,
-    NSColor,
-    NSScreen,
-    NSBorderlessWindowMask,
-    NSApplication,
-)
-from Quartz import CGShieldingWindowLevel
+# Single NSSound reused for every beep, created on first alert
+_ping_sound = None
+
+# Set while a beep or flash sequence is scheduled so alerts don't overlap
+_beeping = False
+_flashing = False
 
 
 def _play_beeps(volume=1.0, count=3, gap=0.25):
-    """Play system Ping sound `count` times with `gap` seconds between."""
-    for i in range(count):
-        sound = NSSound.soundNamed_("Ping")
-        if sound:
-            sound.setVolume_(volume)
-            sound.play()
-            # Wait for sound to finish or gap
-            time.sleep(gap)
-            sound.stop()
+    """Play system Ping sound `count` times with `gap` seconds between.
 
+    Must be called on the main thread; repeats are scheduled on the run
+    loop so no thread sleeps while the beeps play.
+    """
+    global _ping_sound, _beeping
+    if _beeping:
+        return
+
+    from AppKit import NSSound
+    from PyObjCTools import AppHelper
+
+    if _ping_sound is None:
+        _ping_sound = NSSound.soundNamed_("Ping")
+    if _ping_sound is None:
+        return
+
+    _beeping = True
+    try:
+        _ping_sound.setVolume_(volume)
+        _beep_once()
+        for i in range(1, count):
+            AppHelper.callLater(i * gap, _beep_once)
+        AppHelper.callLater(count * gap, _end_beeps)
+    except Exception:
+        # _end_beeps may never run; don't leave beeps disabled for good
+        _beeping = False
+        raise
+
+
+def _beep_once():
+    """Restart the cached Ping sound from the beginning."""
+    _ping_sound.stop()
+    _ping_sound.play()
+
+
+def _end_beeps():
+    global _beeping
+    _ping_sound.stop()
+    _beeping = False
+
+
+# Overlay windows kept between alerts, keyed by display ID -> (window, frame)
+_flash_windows_cache = {}
+
+
+def _flash_windows(alpha):
+    """Return one overlay window per screen, reusing cached windows.
+
+    Windows are only created for new displays and resized when a
+    display's frame changed; displays that went away are dropped.
+    """
+    from AppKit import NSBorderlessWindowMask, NSColor, NSScreen, NSWindow
+    from Quartz import CGShieldingWindowLevel
 
-def _flash_screens(count=3, on_ms=150, off_ms=100, alpha=0.35):
-    """Flash all screens red. Must be called on the main thread."""
-    screens = NSScreen.screens()
     windows = []
+    live = set()
 
-    for screen in screens:
+    for screen in NSScreen.screens():
+        key = screen.deviceDescription()["NSScreenNumber"]
         frame = screen.frame()
-        win = NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
-            frame,
-            NSBorderlessWindowMask,
-            2,  # NSBackingStoreBuffered
-            False,
-        )
-        win.setLevel_(CGShieldingWindowLevel() + 1)
-        win.setBackgroundColor_(NSColor.redColor().colorWithAlphaComponent_(alpha))
-        win.setOpaque_(False)
-        win.setIgnoresMouseEvents_(True)
-        win.setCollectionBehavior_(1 << 0 | 1 << 1)  # canJoinAllSpaces | fullScreen
+        live.add(key)
+
+        cached = _flash_windows_cache.get(key)
+        if cached is not None:
+            win, last_frame = cached
+            if last_frame != frame:
+                win.setFrame_display_(frame, False)
+        else:
+            win = NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
+                frame,
+                NSBorderlessWindowMask,
+                2,  # NSBackingStoreBuffered
+                False,
+            )
+            win.setReleasedWhenClosed_(False)
+            win.setLevel_(CGShieldingWindowLevel() + 1)
+            win.setBackgroundColor_(
+                NSColor.redColor().colorWithAlphaComponent_(alpha)
+            )
+            win.setOpaque_(False)
+            win.setIgnoresMouseEvents_(True)
+            win.setCollectionBehavior_(1 << 0 | 1 << 1)  # canJoinAllSpaces | fullScreen
+        _flash_windows_cache[key] = (win, frame)
         windows.append(win)
 
-    for i in range(count):
-        for win in windows:
-            win.orderFrontRegardless()
-        time.sleep(on_ms / 1000.0)
-        for win in windows:
+    for key in list(_flash_windows_cache):
+        if key not in live:
+            win, _ = _flash_windows_cache.pop(key)
             win.orderOut_(None)
-        if i < count - 1:
-            time.sleep(off_ms / 1000.0)
+            win.close()
 
+    return windows
+
+
+def _flash_screens(count=3, on_ms=150, off_ms=100, alpha=0.35):
+    """Flash all screens red. Must be called on the main thread."""
+    global _flashing
+    if _flashing:
+        return
+
+    from PyObjCTools import AppHelper
+
+    windows = _flash_windows(alpha)
+
+    # Schedule each on/off step on the run loop so beeps keep their timing
+    _flashing = True
+    try:
+        period = (on_ms + off_ms) / 1000.0
+        for i in range(count):
+            start = i * period
+            AppHelper.callLater(start, _show_windows, windows)
+            AppHelper.callLater(start + on_ms / 1000.0, _hide_windows, windows)
+        AppHelper.callLater(count * period, _end_flash)
+    except Exception:
+        # _end_flash may never run; don't leave flashes disabled for good
+        _flashing = False
+        raise
+
+
+def _show_windows(windows):
+    for win in windows:
+        win.orderFrontRegardless()
+
+
+def _hide_windows(windows):
     for win in windows:
-        win.close()
+        win.orderOut_(None)
+
+
+def _end_flash():
+    global _flashing
+    _flashing = False
 
 
 def trigger_alert(volume=1.0, sound_enabled=True, flash_enabled=True):
     """Fire the full alert (sound + flash). Safe to call from any thread."""
+    from PyObjCTools import AppHelper
+
     if sound_enabled:
-        threading.Thread(target=_play_beeps, args=(volume,), daemon=True).start()
+        AppHelper.callAfter(_play_beeps, volume)
 
     if flash_enabled:
         # Flash must run on main thread for NSWindow operations
-        from PyObjCTools import AppHelper
-
         AppHelper.callAfter(_flash_screens)
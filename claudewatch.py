@@ -9,12 +9,16 @@ import time
 from datetime import datetime
 
 import rumps
+from PyObjCTools import AppHelper
 
 import alert
 import config
 import usage
 
 SOCK_PATH = "/tmp/claudewatch.sock"
+MAX_MESSAGE = 65536  # largest hook payload read per datagram
+RCVBUF_SIZE = 256 * 1024
+IPC_ERROR_BACKOFF = 0.1  # seconds to wait after a failed receive
 
 
 class ClaudeWatchApp(rumps.App):
@@ -24,110 +28,67 @@ class ClaudeWatchApp(rumps.App):
         super().__init__(icon_title, quit_button=None)
 
         self.last_alert_time = None
+        self._last_fire_ts = None
+        self._create_menu()
         self._build_menu()
         self._start_ipc_listener()
 
     # ── Menu Construction ──────────────────────────────────────────────
 
-    def _build_menu(self):
-        """Build the full menu from scratch."""
-        self.menu.clear()
+    def _create_menu(self):
+        """Create every menu item once and keep references for updates."""
+        self._items = {}
+        self._last_titles = {}
+        self._model_items = []
 
-        weekly = usage.get_weekly_stats()
-        session = usage.get_session_stats()
+        def item(key, callback=None):
+            # Placeholder title doubles as a unique rumps menu key
+            self._items[key] = rumps.MenuItem(key, callback=callback)
+            return self._items[key]
 
         # Weekly Usage submenu
-        weekly_menu = rumps.MenuItem("Weekly Usage")
-        weekly_menu.add(rumps.MenuItem(
-            f"Messages: {weekly['messages']:,}", callback=None
-        ))
-        weekly_menu.add(rumps.MenuItem(
-            f"Sessions: {weekly['sessions']:,}", callback=None
-        ))
-        weekly_menu.add(rumps.MenuItem(
-            f"Tool Calls: {weekly['tool_calls']:,}", callback=None
-        ))
-        weekly_menu.add(rumps.separator)
-        weekly_menu.add(rumps.MenuItem("Tokens by Model:", callback=None))
-        if weekly["tokens_by_model"]:
-            for model, count in sorted(
-                weekly["tokens_by_model"].items(), key=lambda x: -x[1]
-            ):
-                weekly_menu.add(rumps.MenuItem(
-                    f"  {model}: {usage._format_tokens(count)}", callback=None
-                ))
-        else:
-            weekly_menu.add(rumps.MenuItem("  (none this week)", callback=None))
-
-        self.menu.add(weekly_menu)
+        self._weekly_menu = rumps.MenuItem("Weekly Usage")
+        self._weekly_menu.add(item("weekly_messages"))
+        self._weekly_menu.add(item("weekly_sessions"))
+        self._weekly_menu.add(item("weekly_tool_calls"))
+        self._weekly_menu.add(rumps.separator)
+        self._weekly_menu.add(rumps.MenuItem("Tokens by Model:", callback=None))
+        self._weekly_menu.add(item("weekly_no_models"))
+
+        self.menu.add(self._weekly_menu)
         self.menu.add(rumps.separator)
 
         # Current Session submenu
         session_menu = rumps.MenuItem("Current Session")
-        summary = session["summary"]
-        if len(summary) > 40:
-            summary = summary[:37] + "..."
-        session_menu.add(rumps.MenuItem(f"Summary: {summary}", callback=None))
-        session_menu.add(rumps.MenuItem(
-            f"Messages: {session['messages']:,}", callback=None
-        ))
-        session_menu.add(rumps.MenuItem(
-            f"Duration: {session['duration']}", callback=None
-        ))
+        session_menu.add(item("session_summary"))
+        session_menu.add(item("session_messages"))
+        session_menu.add(item("session_duration"))
         session_menu.add(rumps.separator)
-        session_menu.add(rumps.MenuItem(
-            f"Input: {usage._format_tokens(session['input_tokens'])}", callback=None
-        ))
-        session_menu.add(rumps.MenuItem(
-            f"Output: {usage._format_tokens(session['output_tokens'])}", callback=None
-        ))
-        session_menu.add(rumps.MenuItem(
-            f"Cache Read: {usage._format_tokens(session['cache_read'])}", callback=None
-        ))
-        session_menu.add(rumps.MenuItem(
-            f"Cache Create: {usage._format_tokens(session['cache_create'])}",
-            callback=None,
-        ))
+        session_menu.add(item("session_input"))
+        session_menu.add(item("session_output"))
+        session_menu.add(item("session_cache_read"))
+        session_menu.add(item("session_cache_create"))
 
         self.menu.add(session_menu)
         self.menu.add(rumps.separator)
 
         # Last Alert
-        if self.last_alert_time:
-            last_str = self.last_alert_time.strftime("%H:%M:%S")
-        else:
-            last_str = "None"
-        self.menu.add(rumps.MenuItem(f"Last Alert: {last_str}", callback=None))
+        self.menu.add(item("last_alert"))
         self.menu.add(rumps.separator)
 
         # Toggle items
-        sound_item = rumps.MenuItem(
-            f"Sound: {'ON' if self.cfg['sound_enabled'] else 'OFF'}",
-            callback=self._toggle_sound,
-        )
-        flash_item = rumps.MenuItem(
-            f"Flash: {'ON' if self.cfg['flash_enabled'] else 'OFF'}",
-            callback=self._toggle_flash,
-        )
-        mute_item = rumps.MenuItem(
-            "Unmute All" if self.cfg["muted"] else "Mute All",
-            callback=self._toggle_mute,
-        )
-
-        self.menu.add(sound_item)
-        self.menu.add(flash_item)
-        self.menu.add(mute_item)
+        self.menu.add(item("sound", self._toggle_sound))
+        self.menu.add(item("flash", self._toggle_flash))
+        self.menu.add(item("mute", self._toggle_mute))
         self.menu.add(rumps.separator)
 
         # Volume submenu
         volume_menu = rumps.MenuItem("Volume")
         for level in ("loud", "medium", "low"):
-            prefix = "\u2713 " if self.cfg["volume"] == level else "  "
-            item = rumps.MenuItem(
-                f"{prefix}{level.capitalize()}",
-                callback=lambda sender, lv=level: self._set_volume(lv),
-            )
-            volume_menu.add(item)
+            volume_menu.add(item(
+                f"volume_{level}",
+                lambda sender, lv=level: self._set_volume(lv),
+            ))
         self.menu.add(volume_menu)
         self.menu.add(rumps.separator)
 
@@ -138,28 +99,110 @@ class ClaudeWatchApp(rumps.App):
         self.menu.add(rumps.separator)
         self.menu.add(rumps.MenuItem("Quit ClaudeWatch", callback=self._quit))
 
+    def _set_title(self, key, title):
+        """Update a menu item's title only if the text changed."""
+        if self._last_titles.get(key) != title:
+            self._items[key].title = title
+            self._last_titles[key] = title
+
+    def _set_model_rows(self, rows):
+        """Show one pooled row per model, hiding rows left over."""
+        while len(self._model_items) < len(rows):
+            key = f"weekly_model_{len(self._model_items)}"
+            self._items[key] = rumps.MenuItem(key, callback=None)
+            self._weekly_menu.add(self._items[key])
+            self._model_items.append(self._items[key])
+
+        for idx, row in enumerate(self._model_items):
+            key = f"weekly_model_{idx}"
+            if idx < len(rows):
+                self._set_title(key, rows[idx])
+                if row.hidden:
+                    row.hidden = False
+            elif not row.hidden:
+                row.hidden = True
+
+        self._items["weekly_no_models"].hidden = bool(rows)
+
+    def _build_menu(self):
+        """Refresh menu item titles, touching only rows that changed."""
+        weekly = usage.get_weekly_stats()
+        session = usage.get_session_stats()
+
+        # Weekly Usage
+        self._set_title("weekly_messages", f"Messages: {weekly['messages']:,}")
+        self._set_title("weekly_sessions", f"Sessions: {weekly['sessions']:,}")
+        self._set_title(
+            "weekly_tool_calls", f"Tool Calls: {weekly['tool_calls']:,}"
+        )
+        self._set_model_rows([
+            f"  {model}: {tokens}" for model, tokens in weekly["model_rows"]
+        ])
+        self._set_title("weekly_no_models", "  (none this week)")
+
+        # Current Session
+        summary = session["summary"]
+        if len(summary) > 40:
+            summary = summary[:37] + "..."
+        self._set_title("session_summary", f"Summary: {summary}")
+        self._set_title("session_messages", f"Messages: {session['messages']:,}")
+        self._set_title("session_duration", f"Duration: {session['duration']}")
+        self._set_title("session_input", f"Input: {session['input_tokens_str']}")
+        self._set_title("session_output", f"Output: {session['output_tokens_str']}")
+        self._set_title(
+            "session_cache_read", f"Cache Read: {session['cache_read_str']}"
+        )
+        self._set_title(
+            "session_cache_create", f"Cache Create: {session['cache_create_str']}"
+        )
+
+        self._update_last_alert()
+        self._update_settings()
+
+    def _update_last_alert(self):
+        """Refresh the "Last Alert" row."""
+        if self.last_alert_time:
+            last_str = self.last_alert_time.strftime("%H:%M:%S")
+        else:
+            last_str = "None"
+        self._set_title("last_alert", f"Last Alert: {last_str}")
+
+    def _update_settings(self):
+        """Refresh the toggle and volume rows from the current config."""
+        self._set_title(
+            "sound", f"Sound: {'ON' if self.cfg['sound_enabled'] else 'OFF'}"
+        )
+        self._set_title(
+            "flash", f"Flash: {'ON' if self.cfg['flash_enabled'] else 'OFF'}"
+        )
+        self._set_title("mute", "Unmute All" if self.cfg["muted"] else "Mute All")
+
+        for level in ("loud", "medium", "low"):
+            prefix = "\u2713 " if self.cfg["volume"] == level else "  "
+            self._set_title(f"volume_{level}", f"{prefix}{level.capitalize()}")
+
     # ── Callbacks ──────────────────────────────────────────────────────
 
     def _toggle_sound(self, sender):
         self.cfg["sound_enabled"] = not self.cfg["sound_enabled"]
         config.save(self.cfg)
-        self._build_menu()
+        self._update_settings()
 
     def _toggle_flash(self, sender):
         self.cfg["flash_enabled"] = not self.cfg["flash_enabled"]
         config.save(self.cfg)
-        self._build_menu()
+        self._update_settings()
 
     def _toggle_mute(self, sender):
         self.cfg["muted"] = not self.cfg["muted"]
         config.save(self.cfg)
         self.title = "\U0001f515" if self.cfg["muted"] else "\U0001f514"
-        self._build_menu()
+        self._update_settings()
 
     def _set_volume(self, level):
         self.cfg["volume"] = level
         config.save(self.cfg)
-        self._build_menu()
+        self._update_settings()
 
     def _refresh(self, sender=None):
         # Invalidate usage caches
@@ -167,6 +210,11 @@ class ClaudeWatchApp(rumps.App):
         usage._cache["stats_data"] = None
         usage._cache["session_mtime"] = 0
         usage._cache["session_data"] = None
+        # Drop incremental parse state so the session is reparsed in full
+        usage._cache["session_size"] = 0
+        usage._cache["session_totals"] = None
+        usage._cache["session_seen_req_ids"] = None
+        usage._cache["session_msg_count"] = 0
         self._build_menu()
 
     def _test_alert(self, sender):
@@ -179,26 +227,35 @@ class ClaudeWatchApp(rumps.App):
     # ── Alert Dispatch ─────────────────────────────────────────────────
 
     def _fire_alert(self):
-        """Fire alert respecting mute and per-channel settings."""
+        """Fire alert respecting mute, debounce and per-channel settings."""
         self.last_alert_time = datetime.now()
 
+        self._update_last_alert()
+
         if self.cfg.get("muted"):
-            self._build_menu()
             return
 
+        # Collapse bursts of hooks (e.g. Stop right after Notification)
+        now = time.monotonic()
+        debounce = self.cfg.get("alert_debounce_sec", 1.5)
+        if self._last_fire_ts is not None and now - self._last_fire_ts < debounce:
+            return
+        self._last_fire_ts = now
+
         vol = config.get_volume_float(self.cfg)
         alert.trigger_alert(
             volume=vol,
             sound_enabled=self.cfg.get("sound_enabled", True),
             flash_enabled=self.cfg.get("flash_enabled", True),
         )
-        self._build_menu()
 
     # ── IPC Listener ───────────────────────────────────────────────────
 
     def _start_ipc_listener(self):
         """Start a background thread listening on the Unix socket."""
         self._cleanup_socket()
+        # Reused across messages so receiving an alert never allocates
+        self._ipc_buf = bytearray(MAX_MESSAGE)
         t = threading.Thread(target=self._ipc_loop, daemon=True)
         t.start()
 
@@ -209,34 +266,33 @@ class ClaudeWatchApp(rumps.App):
             pass
 
     def _ipc_loop(self):
-        """Accept connections on the Unix socket and fire alerts."""
-        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        """Receive datagrams on the Unix socket and fire alerts."""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # Headroom for bursts of hook messages arriving back to back
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_SIZE)
         server.bind(SOCK_PATH)
-        server.listen(5)
-        # Make socket world-writable so hook can connect
+        # Make socket world-writable so hook can send to it
         os.chmod(SOCK_PATH, 0o777)
 
         while True:
             try:
-                conn, _ = server.accept()
-                data = b""
+                nbytes = server.recv_into(self._ipc_buf)
+                # Drain whatever else is queued so a burst is one wakeup
                 while True:
-                    chunk = conn.recv(4096)
-                    if not chunk:
+                    try:
+                        nbytes += server.recv_into(
+                            self._ipc_buf, 0, socket.MSG_DONTWAIT
+                        )
+                    except OSError:
+                        # Empty queue (or a drain error): still fire for
+                        # the datagrams already received
                         break
-                    data += chunk
-                conn.close()
-
-                if data:
-                    # Dispatch alert to main thread via rumps timer trick
-                    rumps.Timer(self._on_ipc_message, 0).start()
+                if nbytes:
+                    # Hop to the main thread without allocating a timer
+                    AppHelper.callAfter(self._fire_alert)
             except Exception:
-                continue
-
-    def _on_ipc_message(self, timer):
-        """Called on main thread when IPC message received."""
-        timer.stop()
-        self._fire_alert()
+                # Back off so a persistent socket error can't spin the CPU
+                time.sleep(IPC_ERROR_BACKOFF)
 
     # ── Periodic Refresh ───────────────────────────────────────────────
 
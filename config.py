@@ -11,6 +11,7 @@ DEFAULTS = {
     "flash_enabled": True,
     "muted": False,
     "volume": "loud",  # loud, medium, low
+    "alert_debounce_sec": 1.5,  # alerts closer together collapse into one
 }
 
 VOLUME_LEVELS = {
@@ -19,6 +20,9 @@ VOLUME_LEVELS = {
     "low": 0.2,
 }
 
+# Copy of the last config written, used to skip redundant saves
+_last_saved_cfg = None
+
 
 def load():
     """Load config from disk, returning defaults for missing keys."""
@@ -33,10 +37,21 @@ def load():
 
 
 def save(cfg):
-    """Persist config to disk."""
+    """Persist config to disk, skipping writes when nothing changed.
+
+    Writes to a temp file and renames it over the config so a crash
+    mid-write never leaves a truncated file behind.
+    """
+    global _last_saved_cfg
+    if cfg == _last_saved_cfg:
+        return
+
     os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(CONFIG_PATH, "w") as f:
+    tmp_path = CONFIG_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
         json.dump(cfg, f, indent=2)
+    os.replace(tmp_path, CONFIG_PATH)
+    _last_saved_cfg = dict(cfg)
 
 
 def get_volume_float(cfg):
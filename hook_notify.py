@@ -3,7 +3,8 @@
 
 Called by Claude Code on Stop (response finishes) and Notification
 (permission prompts, alerts) events. Reads JSON from stdin and forwards
-it to ClaudeWatch via Unix socket at /tmp/claudewatch.sock.
+it to ClaudeWatch as a single datagram on the Unix socket at
+/tmp/claudewatch.sock.
 
 All exceptions are caught silently so this never blocks Claude Code.
 """
@@ -14,6 +15,7 @@ import sys
 
 SOCK_PATH = "/tmp/claudewatch.sock"
 TIMEOUT = 3  # seconds (under hook's 5-second limit)
+MAX_MESSAGE = 65536  # must match claudewatch.MAX_MESSAGE
 
 
 def main():
@@ -22,10 +24,13 @@ def main():
         # Validate it's JSON
         json.loads(data)
 
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        payload = data.encode("utf-8")[:MAX_MESSAGE]
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # macOS caps Unix datagrams at SO_SNDBUF (2 KiB by default)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MAX_MESSAGE)
         sock.settimeout(TIMEOUT)
-        sock.connect(SOCK_PATH)
-        sock.sendall(data.encode("utf-8"))
+        sock.sendto(payload, SOCK_PATH)
         sock.close()
     except Exception:
         pass
@@ -18,7 +18,7 @@ python3 -m venv "$VENV_DIR"
 echo "  Created at $VENV_DIR"
 
 echo "[2/4] Installing Python dependencies..."
-"$VENV_DIR/bin/pip" install --quiet rumps pyobjc-framework-Cocoa pyobjc-framework-Quartz
+"$VENV_DIR/bin/pip" install --quiet rumps pyobjc-framework-Cocoa pyobjc-framework-Quartz orjson
 echo "  Done."
 
 # 3. Add Stop hook to Claude Code settings
@@ -1,9 +1,17 @@
 """Parse Claude Code stats and session data for ClaudeWatch."""
 
-import glob
+import functools
 import json
 import os
-from datetime import datetime, timedelta
+import stat
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+try:
+    # Much faster per-line decoding for large session transcripts
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 CLAUDE_DIR = os.path.expanduser("~/.claude")
 STATS_PATH = os.path.join(CLAUDE_DIR, "stats-cache.json")
@@ -15,16 +23,44 @@ _cache = {
     "stats_data": None,
     "session_path": None,
     "session_mtime": 0,
+    "session_size": 0,
+    "session_totals": None,
+    "session_seen_req_ids": None,
+    "session_msg_count": 0,
     "session_data": None,
+    "indexes": {},  # index_path -> (mtime, entries)
+}
+
+# Known model IDs -> display names
+_MODEL_NAMES = {
+    "claude-opus-4-5-20251101": "Opus 4.5",
+    "claude-sonnet-4-5-20250929": "Sonnet 4.5",
+    "claude-haiku-4-5-20251001": "Haiku 4.5",
+}
+
+# result key -> usage field in assistant message records
+_TOKEN_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_read": "cache_read_input_tokens",
+    "cache_create": "cache_creation_input_tokens",
 }
 
 
 def _current_week_bounds():
-    """Return (monday, sunday) date strings for the current ISO week."""
+    """Return (monday, sunday) dates for the current ISO week."""
     today = datetime.now().date()
     monday = today - timedelta(days=today.weekday())
     sunday = monday + timedelta(days=6)
-    return monday.isoformat(), sunday.isoformat()
+    return monday, sunday
+
+
+def _safe_stat(path):
+    """Return os.stat(path), or None if the path can't be stat'ed."""
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
 
 
 def _format_tokens(n):
@@ -36,14 +72,13 @@ def _format_tokens(n):
     return str(n)
 
 
+@functools.lru_cache(maxsize=64)
 def _friendly_model_name(model_id):
     """Convert a model ID to a friendly display name."""
-    mapping = {
-        "claude-opus-4-5-20251101": "Opus 4.5",
-        "claude-sonnet-4-5-20250929": "Sonnet 4.5",
-        "claude-haiku-4-5-20251001": "Haiku 4.5",
-    }
-    for key, name in mapping.items():
+    name = _MODEL_NAMES.get(model_id)
+    if name is not None:
+        return name
+    for key, name in _MODEL_NAMES.items():
         if key in model_id:
             return name
     return model_id
@@ -52,7 +87,8 @@ def _friendly_model_name(model_id):
 def get_weekly_stats():
     """Return weekly usage stats from stats-cache.json.
 
-    Returns dict with keys: messages, sessions, tool_calls, tokens_by_model.
+    Returns dict with keys: messages, sessions, tool_calls, tokens_by_model,
+    and model_rows — (model, formatted tokens) pairs sorted by usage.
     Uses mtime caching.
     """
     result = {
@@ -60,12 +96,13 @@ def get_weekly_stats():
         "sessions": 0,
         "tool_calls": 0,
         "tokens_by_model": {},
+        "model_rows": [],
     }
 
-    try:
-        mtime = os.path.getmtime(STATS_PATH)
-    except OSError:
+    st = _safe_stat(STATS_PATH)
+    if st is None:
         return result
+    mtime = st.st_mtime
 
     if mtime == _cache["stats_mtime"] and _cache["stats_data"] is not None:
         return _cache["stats_data"]
@@ -77,62 +114,169 @@ def get_weekly_stats():
         return result
 
     mon, sun = _current_week_bounds()
+    tokens_by_model = result["tokens_by_model"]
+
+    # Both lists hold one object per day; walk them in a single pass
+    for day in chain(
+        data.get("dailyActivity", []), data.get("dailyModelTokens", [])
+    ):
+        try:
+            d = date.fromisoformat(day.get("date", ""))
+        except (TypeError, ValueError):
+            continue
+        if not mon <= d <= sun:
+            continue
+
+        result["messages"] += day.get("messageCount", 0)
+        result["sessions"] += day.get("sessionCount", 0)
+        result["tool_calls"] += day.get("toolCallCount", 0)
+        for model, count in day.get("tokensByModel", {}).items():
+            friendly = _friendly_model_name(model)
+            tokens_by_model[friendly] = tokens_by_model.get(friendly, 0) + count
 
-    for day in data.get("dailyActivity", []):
-        d = day.get("date", "")
-        if mon <= d <= sun:
-            result["messages"] += day.get("messageCount", 0)
-            result["sessions"] += day.get("sessionCount", 0)
-            result["tool_calls"] += day.get("toolCallCount", 0)
-
-    for day in data.get("dailyModelTokens", []):
-        d = day.get("date", "")
-        if mon <= d <= sun:
-            for model, count in day.get("tokensByModel", {}).items():
-                friendly = _friendly_model_name(model)
-                result["tokens_by_model"][friendly] = (
-                    result["tokens_by_model"].get(friendly, 0) + count
-                )
+    result["model_rows"] = [
+        (model, _format_tokens(count))
+        for model, count in sorted(tokens_by_model.items(), key=lambda x: -x[1])
+    ]
 
     _cache["stats_mtime"] = mtime
     _cache["stats_data"] = result
     return result
 
 
+def _load_index_entries(index_path, index_mtime):
+    """Return the entries of a sessions-index.json, cached by mtime."""
+    cached = _cache["indexes"].get(index_path)
+    if cached is not None and cached[0] == index_mtime:
+        return cached[1]
+
+    try:
+        with open(index_path, "r") as f:
+            entries = json.load(f).get("entries", [])
+    except (OSError, json.JSONDecodeError):
+        entries = []
+
+    _cache["indexes"][index_path] = (index_mtime, entries)
+    return entries
+
+
+def _mtime_secs(file_mtime):
+    """Convert an index fileMtime (epoch ms, as Node writes it) to seconds."""
+    # Epoch seconds stay below 1e11 for millennia; larger values are ms
+    if file_mtime >= 1e11:
+        return file_mtime / 1000.0
+    return file_mtime
+
+
 def _find_latest_session():
     """Find the most recently modified session across all projects.
 
-    Returns (session_entry, jsonl_path) or (None, None).
+    Indexes are visited newest first, and the scan stops once the best
+    recorded fileMtime is at least the next index's mtime: an index
+    can't record a fileMtime later than its own write, so older indexes
+    cannot hold a newer entry. In the steady state only one index is
+    parsed.
+
+    Returns (session_entry, jsonl_path, jsonl_stat) or (None, None, None).
     """
     best_entry = None
     best_mtime = 0
     best_path = None
+    best_stat = None
 
-    pattern = os.path.join(PROJECTS_DIR, "*/sessions-index.json")
-    for index_path in glob.glob(pattern):
-        try:
-            with open(index_path, "r") as f:
-                index = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            continue
+    candidates = []
+    try:
+        with os.scandir(PROJECTS_DIR) as it:
+            for project in it:
+                if not project.is_dir():
+                    continue
+                index_path = os.path.join(project.path, "sessions-index.json")
+                index_stat = _safe_stat(index_path)
+                if index_stat is None:
+                    continue
+                candidates.append((index_stat.st_mtime, index_path))
+    except OSError:
+        return None, None, None
+
+    candidates.sort(reverse=True)
+
+    for index_mtime, index_path in candidates:
+        if best_entry is not None and _mtime_secs(best_mtime) >= index_mtime:
+            break
 
-        for entry in index.get("entries", []):
+        for entry in _load_index_entries(index_path, index_mtime):
             mtime = entry.get("fileMtime", 0)
             if mtime > best_mtime:
                 jsonl_path = entry.get("fullPath", "")
-                if os.path.isfile(jsonl_path):
-                    best_mtime = mtime
-                    best_entry = entry
-                    best_path = jsonl_path
+                st = _safe_stat(jsonl_path)
+                if st is None or not stat.S_ISREG(st.st_mode):
+                    continue
+                best_mtime = mtime
+                best_entry = entry
+                best_path = jsonl_path
+                best_stat = st
+
+    return best_entry, best_path, best_stat
+
+
+def _parse_session_lines(f, totals, seen_request_ids):
+    """Accumulate token usage from complete JSONL lines read from `f`.
+
+    Updates `totals` and `seen_request_ids` (hashes of request IDs) in
+    place and returns the number of real user messages seen. A trailing
+    line without a newline is still being written, so the file is left
+    positioned before it.
+    """
+    msg_count = 0
+
+    for line in f:
+        if not line.endswith(b"\n"):
+            f.seek(-len(line), os.SEEK_CUR)
+            break
+        # Claude Code writes compact JSON, so a substring check skips
+        # tool/system records without paying for a full decode
+        if b'"type":"assistant"' not in line and b'"type":"user"' not in line:
+            continue
+        try:
+            obj = _json_loads(line)
+        except ValueError:
+            continue
 
-    return best_entry, best_path
+        obj_type = obj.get("type")
+
+        if obj_type == "user" and not obj.get("isMeta"):
+            msg = obj.get("message", {})
+            if msg.get("role") == "user":
+                content = msg.get("content", "")
+                # Only count real user messages (not tool results)
+                if isinstance(content, str) and content:
+                    msg_count += 1
+
+        if obj_type == "assistant":
+            msg = obj.get("message", {})
+            usage = msg.get("usage", {})
+            req_id = obj.get("requestId", "")
+
+            if req_id:
+                # Only the 64-bit hash is kept; collisions are negligible
+                # and the set lives as long as the session cache
+                req_hash = hash(req_id)
+                if req_hash in seen_request_ids:
+                    continue
+                seen_request_ids.add(req_hash)
+
+            for key, field in _TOKEN_FIELDS.items():
+                totals[key] += usage.get(field, 0)
+
+    return msg_count
 
 
 def get_session_stats():
     """Return current (latest) session stats.
 
     Returns dict with keys: summary, messages, duration, input_tokens,
-    output_tokens, cache_read, cache_create, session_id.
+    output_tokens, cache_read, cache_create, session_id, plus a display
+    string for each token count (input_tokens_str, ...).
     Uses mtime caching.
     """
     result = {
@@ -145,15 +289,14 @@ def get_session_stats():
         "cache_create": 0,
         "session_id": None,
     }
+    for key in _TOKEN_FIELDS:
+        result[key + "_str"] = "0"
 
-    entry, jsonl_path = _find_latest_session()
+    # The stat taken while picking the session is reused for caching
+    entry, jsonl_path, st = _find_latest_session()
     if entry is None or jsonl_path is None:
         return result
-
-    try:
-        mtime = os.path.getmtime(jsonl_path)
-    except OSError:
-        return result
+    mtime, size = st.st_mtime, st.st_size
 
     if (
         jsonl_path == _cache["session_path"]
@@ -188,53 +331,45 @@ def get_session_stats():
         except (ValueError, TypeError):
             pass
 
-    # Parse JSONL for token counts — deduplicate by requestId
-    seen_request_ids = set()
-    msg_count = 0
+    # Sessions are append-only: resume from the last parsed offset when
+    # the same file has grown, otherwise start over from the beginning.
+    if (
+        jsonl_path == _cache["session_path"]
+        and size >= _cache["session_size"]
+        and _cache["session_totals"] is not None
+    ):
+        offset = _cache["session_size"]
+        totals = _cache["session_totals"]
+        seen_request_ids = _cache["session_seen_req_ids"]
+        msg_count = _cache["session_msg_count"]
+    else:
+        offset = 0
+        totals = {key: 0 for key in _TOKEN_FIELDS}
+        seen_request_ids = set()
+        msg_count = 0
 
     try:
-        with open(jsonl_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                obj_type = obj.get("type")
-
-                if obj_type == "user" and not obj.get("isMeta"):
-                    msg = obj.get("message", {})
-                    if msg.get("role") == "user":
-                        content = msg.get("content", "")
-                        # Only count real user messages (not tool results)
-                        if isinstance(content, str) and content:
-                            msg_count += 1
-
-                if obj_type == "assistant":
-                    msg = obj.get("message", {})
-                    usage = msg.get("usage", {})
-                    req_id = obj.get("requestId", "")
-
-                    if req_id and req_id in seen_request_ids:
-                        continue
-                    if req_id:
-                        seen_request_ids.add(req_id)
-
-                    result["input_tokens"] += usage.get("input_tokens", 0)
-                    result["output_tokens"] += usage.get("output_tokens", 0)
-                    result["cache_read"] += usage.get("cache_read_input_tokens", 0)
-                    result["cache_create"] += usage.get(
-                        "cache_creation_input_tokens", 0
-                    )
+        with open(jsonl_path, "rb") as f:
+            f.seek(offset)
+            msg_count += _parse_session_lines(f, totals, seen_request_ids)
+            offset = f.tell()
     except OSError:
-        pass
+        # Partial reads leave the totals unreliable; forget the session so
+        # the next call reparses it from scratch instead of hitting the cache
+        _cache["session_path"] = None
+        _cache["session_data"] = None
+        return result
 
+    for key, count in totals.items():
+        result[key] = count
+        result[key + "_str"] = _format_tokens(count)
     result["messages"] = msg_count
 
     _cache["session_path"] = jsonl_path
     _cache["session_mtime"] = mtime
+    _cache["session_size"] = offset
+    _cache["session_totals"] = totals
+    _cache["session_seen_req_ids"] = seen_request_ids
+    _cache["session_msg_count"] = msg_count
     _cache["session_data"] = result
     return result